@@ -2,3 +2,4 @@ from .match import Match
 from .matchcask import MatchCask
 from .negation import Negation
 from .pattern import Pattern
+from .pattern_set import PatternSet
@@ -0,0 +1,212 @@
+"""
+Inspect the structure of regular expressions to determine which shortcuts
+    can safely be applied when running a `Pattern`.
+"""
+from functools import lru_cache
+from typing import Optional, Tuple
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # python < 3.11
+    import sre_parse
+    import sre_constants
+
+# `re.IGNORECASE` treats these as equivalent to 'i', but `str.casefold` does not
+_DOTTED_I = str.maketrans({'\u0130': 'i', '\u0131': 'i'})
+
+# assertions whose result depends on text outside of the match itself
+_CONTEXT_DEPENDENT_AT = {
+    sre_constants.AT_BEGINNING, sre_constants.AT_BEGINNING_LINE, sre_constants.AT_BEGINNING_STRING,
+    sre_constants.AT_END, sre_constants.AT_END_LINE, sre_constants.AT_END_STRING,
+}
+
+
+def parse(pattern: str, flags=0):
+    """Parse regular expression into a tree, or None if it cannot be parsed (e.g., other backend's syntax)"""
+    try:
+        return sre_parse.parse(pattern, flags)
+    except Exception:
+        return None
+
+
+def _iter_subpatterns(av):
+    if isinstance(av, sre_parse.SubPattern):
+        yield av
+    elif isinstance(av, (tuple, list)):
+        for item in av:
+            yield from _iter_subpatterns(item)
+
+
+def walk(tree):
+    """Yield all (opcode, argument) pairs in parsed regular expression"""
+    for op, av in tree:
+        yield op, av
+        for subpattern in _iter_subpatterns(av):
+            yield from walk(subpattern)
+
+
+@lru_cache(maxsize=4096)
+def is_context_free(pattern: str, flags=0) -> bool:
+    """
+    Whether a match depends only on the characters it covers (and, for word boundaries,
+        the adjacent characters). Such a pattern will find a match within any substring
+        (bounded by non-word characters) when run over the entire text.
+    :param pattern: regular expression (uncompiled string)
+    :param flags:
+    :return: False if the pattern contains anchors or lookarounds, or cannot be parsed
+    """
+    tree = parse(pattern, flags)
+    if tree is None:
+        return False
+    for op, av in walk(tree):
+        if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            return False
+        if op == sre_constants.AT and av in _CONTEXT_DEPENDENT_AT:
+            return False
+    return True
+
+
+@lru_cache(maxsize=4096)
+def has_group_references(pattern: str, flags=0) -> bool:
+    """
+    Whether the pattern refers back to its own groups (e.g., backreferences), which
+        will break if it is embedded in a larger regular expression.
+    :return: True if the pattern contains group references, or cannot be parsed
+    """
+    tree = parse(pattern, flags)
+    if tree is None:
+        return True
+    return any(op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS) for op, _ in walk(tree))
+
+
+@lru_cache(maxsize=4096)
+def has_global_flags(pattern: str, flags=0) -> bool:
+    """
+    Whether the pattern sets flags for the entire expression (e.g., `(?x)`), which would
+        apply to all of a larger regular expression in which it is embedded (python < 3.11
+        only warns about such flags not at the start)
+    :return: True if the pattern contains global inline flags, or cannot be parsed
+    """
+    tree = parse(pattern, flags)
+    if tree is None:
+        return True
+    return (tree.state.flags & ~sre_constants.SRE_FLAG_UNICODE) != (flags & ~sre_constants.SRE_FLAG_UNICODE)
+
+
+@lru_cache(maxsize=4096)
+def literal_text(pattern: str, flags=0) -> Optional[str]:
+    """
+    Text matched by a pattern which consists only of literal characters (e.g., 'burden')
+    :return: None if pattern contains any other syntax, or cannot be parsed
+    """
+    tree = parse(pattern, flags)
+    if not tree or any(op != sre_constants.LITERAL for op, _ in tree):
+        return None
+    return ''.join(chr(av) for _, av in tree)
+
+
+def fold(text: str) -> str:
+    """Case-fold text such that every case-insensitive match (with `re`) can still be found"""
+    if not text.isascii():
+        text = text.translate(_DOTTED_I)
+    return text.casefold()
+
+
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+if hasattr(sre_constants, 'POSSESSIVE_REPEAT'):  # python 3.11+
+    _REPEATS.add(sre_constants.POSSESSIVE_REPEAT)
+
+
+# limit on alternative literals, e.g., from cross product of (a|b)(c|d)
+_MAX_ALTERNATIVES = 16
+
+
+def _branch_literals(branches) -> Optional[Tuple[str, ...]]:
+    """All texts which the alternation can match, or None if any branch is not a plain literal"""
+    alternatives = []
+    for branch in branches:
+        interrupted = []
+        runs = _extend_literal_runs(branch, ('',), interrupted)
+        if interrupted:
+            return None
+        alternatives.extend(runs)
+    return tuple(dict.fromkeys(alternatives))
+
+
+def _class_literals(items) -> Optional[Tuple[str, ...]]:
+    """Characters in the character class, or None if it is not a set of plain literals"""
+    if any(op != sre_constants.LITERAL for op, _ in items):  # e.g., ranges, negation
+        return None
+    return tuple(dict.fromkeys(chr(av) for _, av in items))
+
+
+def _extend_literal_runs(tree, runs, found, min_length=3) -> Tuple[str, ...]:
+    """
+    Follow the literal text through the parsed regular expression
+    :param tree: parsed regular expression
+    :param runs: alternative texts of the run of literals immediately preceding `tree`
+    :param found: list to which alternatives are added once a run is interrupted;
+        at least one of each tuple of alternatives must appear in every match
+    :param min_length: see `required_literals`
+    :return: alternative texts of the run of literals at the end of `tree`
+    """
+    for op, av in tree:
+        if op == sre_constants.LITERAL:
+            runs = tuple(run + chr(av) for run in runs)
+            continue
+        if op == sre_constants.SUBPATTERN:  # concatenation continues into the group
+            runs = _extend_literal_runs(av[-1], runs, found, min_length)
+            continue
+        if op == sre_constants.AT:  # zero-width, e.g., word boundary
+            continue
+        if op == sre_constants.BRANCH:
+            alternatives = _branch_literals(av[1])
+        elif op == sre_constants.IN:  # e.g., [ab], including single-character branches (a|b)
+            alternatives = _class_literals(av)
+        else:
+            alternatives = None
+        if alternatives and len(runs) * len(alternatives) <= _MAX_ALTERNATIVES:
+            runs = tuple(run + alt for run in runs for alt in alternatives)
+            continue
+        found.append(runs)
+        runs = ('',)
+        if op == sre_constants.BRANCH:  # each branch must contribute one of its literals
+            branch_literals = [_select_literals(branch, min_length) for branch in av[1]]
+            if all(branch_literals):
+                alternatives = tuple(dict.fromkeys(lit for lits in branch_literals for lit in lits))
+                if len(alternatives) <= _MAX_ALTERNATIVES:
+                    found.append(alternatives)
+        elif op in _REPEATS and av[0] >= 1:
+            found.append(_extend_literal_runs(av[-1], ('',), found, min_length))
+        elif op == getattr(sre_constants, 'ATOMIC_GROUP', None):
+            found.append(_extend_literal_runs(av, ('',), found, min_length))
+    return runs
+
+
+def _select_literals(tree, min_length=3) -> Optional[Tuple[str, ...]]:
+    """Choose the most selective alternatives: longest shortest literal, then fewest alternatives"""
+    found = []
+    found.append(_extend_literal_runs(tree, ('',), found, min_length))
+    useful = [alternatives for alternatives in found if min(map(len, alternatives)) >= min_length]
+    if not useful:
+        return None
+    return max(useful, key=lambda alternatives: (min(map(len, alternatives)), -len(alternatives)))
+
+
+@lru_cache(maxsize=4096)
+def required_literals(pattern: str, flags=0, min_length=3) -> Optional[Tuple[str, ...]]:
+    """
+    Find literal strings, at least one of which must appear in every match. These
+        can be used to cheaply rule out text before running the regular expression.
+    :param pattern: regular expression (uncompiled string)
+    :param flags:
+    :param min_length: ignore literals shorter than this (too common to be useful)
+    :return: tuple of case-folded literals (see `fold`); None if no useful literals found
+    """
+    tree = parse(pattern, flags)
+    if tree is None:
+        return None
+    literals = _select_literals(tree, min_length)
+    if literals is None:
+        return None
+    return tuple(dict.fromkeys(fold(literal) for literal in literals))
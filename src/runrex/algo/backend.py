@@ -0,0 +1,168 @@
+"""
+Regular expression engines which can be used to compile a `Pattern`.
+
+The stdlib `re` module is always available. Other engines are optional
+    and, when not installed, compilation falls back to `re`. The default engine
+    can be set with the `RUNREX_BACKEND` environment variable (e.g., `regex`).
+
+`re2` only matches ASCII with `\\w`, `\\b`, `\\d` and `\\s`: patterns using these fall
+    back to `re` (except `\\w`, `\\b` and `\\d` with `re.ASCII`) so that matches do not change.
+    Likewise for `$` (without `re.MULTILINE`), which does not match before a final newline in `re2`.
+    One difference remains: with `re.IGNORECASE`, `re` (but not `re2`) also matches
+    dotted/dotless 'i' (U+0130, U+0131) in the text with 'i'.
+"""
+import os
+import re
+from functools import lru_cache
+
+from loguru import logger
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import regex
+except ImportError:
+    regex = None
+
+DEFAULT_BACKEND = os.environ.get('RUNREX_BACKEND') or 're'
+
+# inline equivalents of `re` flags for engines which do not accept them directly
+_INLINE_FLAGS = (
+    (re.IGNORECASE, 'i'),
+    (re.MULTILINE, 'm'),
+    (re.DOTALL, 's'),
+)
+
+# `re` flags and the names of their `regex` equivalents
+_REGEX_FLAGS = (
+    (re.IGNORECASE, 'IGNORECASE'),
+    (re.MULTILINE, 'MULTILINE'),
+    (re.DOTALL, 'DOTALL'),
+    (re.VERBOSE, 'VERBOSE'),
+    (re.ASCII, 'ASCII'),
+    (re.UNICODE, 'UNICODE'),
+    (re.LOCALE, 'LOCALE'),
+)
+
+# character classes and word boundaries which are ASCII-only in re2, but Unicode in `re`
+#   (re2 `\s` also omits `\v`, so it always differs); escaped backslashes are not classes
+_UNICODE_CLASSES = re.compile(r'(?<!\\)(?:\\\\)*\\[wWbBdD]')
+_SPACE_CLASSES = re.compile(r'(?<!\\)(?:\\\\)*\\[sS]')
+# without re.MULTILINE, `$` only matches at the very end of the text in re2 (`re` also allows a final newline)
+_END_ANCHOR = re.compile(r'(?<!\\)(?:\\\\)*\$')
+
+
+@lru_cache(maxsize=None)
+def _warn_missing(backend: str):
+    logger.warning(f'{backend} not installed: defaulting to `re` backend')
+
+
+def _to_inline_flags(pattern: str, flags: int):
+    """Move `re` flags into the pattern, e.g., (?i), or return None if not possible"""
+    inline = ''
+    for flag, char in _INLINE_FLAGS:
+        if flags & flag:
+            inline += char
+            flags &= ~flag
+    if flags & ~(re.UNICODE | re.ASCII):  # e.g., re.VERBOSE: no equivalent
+        return None
+    return f'(?{inline}){pattern}' if inline else pattern
+
+
+def _matches_like_re2(pattern: str, flags: int) -> bool:
+    """Whether re2 matches the same text as `re`: not if pattern relies on Unicode classes (e.g., `\\w`) or `$`"""
+    if _SPACE_CLASSES.search(pattern):
+        return False
+    if not flags & re.MULTILINE and _END_ANCHOR.search(pattern):
+        return False
+    if flags & re.IGNORECASE and ('\u0130' in pattern or '\u0131' in pattern):  # `re` treats these as 'i'
+        return False
+    if flags & re.ASCII:  # but re2 still ignores case beyond ASCII (e.g., 'k' matches the Kelvin sign)
+        return not flags & re.IGNORECASE
+    return not _UNICODE_CLASSES.search(pattern)
+
+
+def _compile_re2(pattern: str, flags: int):
+    if re2 is None:
+        _warn_missing('re2')
+        return None
+    inline_pattern = _to_inline_flags(pattern, flags)
+    if inline_pattern is None:
+        logger.debug(f'Flags {flags} not supported by re2: defaulting to `re` for {pattern}')
+        return None
+    if not _matches_like_re2(pattern, flags):
+        logger.debug(f'Unicode classes not supported by re2: defaulting to `re` for {pattern}')
+        return None
+    try:
+        return re2.compile(inline_pattern)
+    except re2.error:  # e.g., lookarounds, backreferences
+        logger.debug(f'Pattern not supported by re2: defaulting to `re` for {pattern}')
+        return None
+
+
+def _to_regex_flags(flags: int):
+    """Equivalent `regex` flags (values differ, e.g., `re.ASCII` is `regex.VERSION1`), or None if not possible"""
+    regex_flags = 0
+    for flag, name in _REGEX_FLAGS:
+        if flags & flag:
+            regex_flags |= getattr(regex, name)
+            flags &= ~flag
+    if flags:  # e.g., re.DEBUG: no equivalent
+        return None
+    return regex_flags
+
+
+def _compile_regex(pattern: str, flags: int):
+    """`regex` supports possessive quantifiers and atomic groups to bound backtracking"""
+    if regex is None:
+        _warn_missing('regex')
+        return None
+    regex_flags = _to_regex_flags(flags)
+    if regex_flags is None:
+        logger.debug(f'Flags {flags} not supported by regex: defaulting to `re` for {pattern}')
+        return None
+    try:
+        return regex.compile(pattern, regex_flags)
+    except regex.error:
+        logger.debug(f'Pattern not supported by regex: defaulting to `re` for {pattern}')
+        return None
+
+
+def pattern_source(compiled, flags: int = 0) -> str:
+    """Pattern (uncompiled string) as passed to `compile_pattern`: re2 also holds inline flags, e.g., (?i)"""
+    text = compiled.pattern
+    if isinstance(compiled, re.Pattern) or (regex is not None and isinstance(compiled, regex.Pattern)):
+        return text
+    prefix = _to_inline_flags('', flags)
+    if prefix and text.startswith(prefix):
+        return text[len(prefix):]
+    return text
+
+
+BACKENDS = {
+    're': None,  # always available
+    're2': _compile_re2,
+    'regex': _compile_regex,
+}
+
+
+def compile_pattern(pattern: str, flags: int = 0, backend: str = None):
+    """
+    Compile `pattern` with the requested backend, falling back to `re` if the
+        backend is not installed or does not support the pattern.
+    :param pattern: regular expression (uncompiled string)
+    :param flags: flags from the `re` module
+    :param backend: name of backend (see `BACKENDS`); None for default
+    :return: compiled pattern with `search`/`finditer`/`sub` interface
+    """
+    backend = backend or DEFAULT_BACKEND
+    try:
+        compile_func = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f'Unrecognized regex backend: {backend}; expected one of {", ".join(BACKENDS)}')
+    if compile_func and (compiled := compile_func(pattern, flags)) is not None:
+        return compiled
+    return re.compile(pattern, flags)
@@ -1,8 +1,7 @@
-import re
-
-
 class Match:
 
+    __slots__ = ['_match', '_groups', '_offset']
+
     def __init__(self, match, groups=None, offset=0):
         self._match = match
         self._groups = groups
@@ -14,7 +13,7 @@ class Match:
 
     @property
     def match(self):
-        if isinstance(self._match, re.Match):
+        if hasattr(self._match, 'group'):  # re.Match or equivalent from another backend
             return self._match.group()
         return str(self._match)
 
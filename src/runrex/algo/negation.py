@@ -1,9 +1,10 @@
-import re
-
 from runrex.algo import Match
 
 
 class Negation:
+
+    __slots__ = ['_term', '_match', '_match_offset']
+
     def __init__(self, term, match, offset=0):
         self._term = term  # negation term
         self._match: Match = match
@@ -37,12 +38,12 @@ class Negation:
 
     @property
     def match(self):
-        if isinstance(self._match, re.Match):
+        if hasattr(self._match, 'group'):  # re.Match or equivalent from another backend
             return self._match.group()
         return str(self._match)
 
     @property
     def term(self):
-        if isinstance(self._term, re.Pattern):
+        if hasattr(self._term, 'pattern'):
             return self._term.pattern
         return str(self._term)
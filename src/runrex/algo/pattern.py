@@ -1,13 +1,41 @@
 import re
-from typing import Iterable
+from functools import lru_cache
+from typing import Iterable, Optional
 
+from runrex.algo.analysis import is_context_free, has_global_flags, has_group_references, literal_text, \
+    required_literals
+from runrex.algo.backend import compile_pattern, pattern_source
 from runrex.algo.direction import DirectionFlag
 from runrex.algo.match import Match
 from runrex.algo.negation import Negation
 
 
+@lru_cache(maxsize=4096)
+def _rewrite_pattern(pattern: str, replace_whitespace, retain_groups=None):
+    """Apply `Pattern` options which alter the text of the regular expression"""
+    if replace_whitespace:
+        pattern = replace_whitespace.join(pattern.split(' '))
+    if retain_groups:
+        for m in re.finditer(r'\?P<(\w+)>', pattern):
+            term = m.group(1)
+            if term in retain_groups:
+                continue
+            pattern = re.sub(rf'\?P<{term}>', r'\?:', pattern)
+    return pattern
+
+
+@lru_cache(maxsize=4096)
+def _compile(pattern: str, flags, backend):
+    """Compile each unique pattern only once, regardless of size of `re`'s internal cache;
+        bounded in case patterns are generated (e.g., from a list of terms)"""
+    return compile_pattern(pattern, flags, backend)
+
+
 class Pattern:
 
+    __slots__ = ['match_count', 'backend', 'flags', 'pattern', 'negates', 'requires', 'requires_all',
+                 'capture_length', '_context_free', 'literals', '_ascii_literal']
+
     def __init__(self, pattern: str, *,
                  negates: Iterable[str] = None,
                  negates_pre: Iterable[str] = None,
@@ -18,7 +46,7 @@ class Pattern:
                  requires_all: Iterable[str] = None,
                  replace_whitespace=r'\W?',
                  capture_length=None, retain_groups=None,
-                 flags=re.IGNORECASE):
+                 flags=re.IGNORECASE, backend=None):
         """
 
         :param pattern: regular expressions (uncompiled string)
@@ -31,27 +59,70 @@ class Pattern:
             has capture_length = 1
             None: i.e., capture_length == max
         :param flags:
+        :param backend: regex engine used to compile patterns (e.g., 're', 're2');
+            falls back to 're' if the engine is not installed or cannot compile the pattern
         """
         self.match_count = 0
-        if replace_whitespace:
-            pattern = replace_whitespace.join(pattern.split(' '))
-        if retain_groups:
-            for m in re.finditer(r'\?P<(\w+)>', pattern):
-                term = m.group(1)
-                if term in retain_groups:
-                    continue
-                pattern = re.sub(rf'\?P<{term}>', r'\?:', pattern)
-        self.pattern = re.compile(pattern, flags)
+        pattern = _rewrite_pattern(pattern, replace_whitespace, tuple(retain_groups) if retain_groups else None)
+        self.backend = backend
+        self.flags = flags
+        self.pattern = _compile(pattern, flags, backend)
         self.negates = list(self._compile_patterns(negates, negates_pre, negates_post, replace_whitespace, flags))
         self.requires = list(self._compile_patterns(requires, requires_pre, requires_post, replace_whitespace, flags))
         self.requires_all = list(self._compile_pattern(requires_all, replace_whitespace, flags))
 
         self.capture_length = capture_length
-        self.text = self.pattern.pattern
+        # the analyses below parse `re` syntax: other engines' syntax may be misread
+        #   (e.g., `regex` fuzzy matching looks like a literal), so they do not apply
+        compiled_by_re = isinstance(self.pattern, re.Pattern)
+        # can a scan over an entire document be used to rule out sentences?
+        self._context_free = compiled_by_re and is_context_free(pattern, flags)
+        # case-folded literals, one of which must be present in any match
+        self.literals = required_literals(pattern, flags) if compiled_by_re else None
+        # a case-insensitive literal (e.g., 'burden') can be found with str.find in ASCII text,
+        #   which is much faster than a case-insensitive regex search
+        self._ascii_literal = None
+        if (compiled_by_re and flags & re.IGNORECASE
+                and (literal := literal_text(pattern, flags)) and literal.isascii()):
+            self._ascii_literal = literal.lower()
+
+    @property
+    def text(self) -> str:
+        """Regular expression as a string (not stored separately: the compiled pattern keeps it)"""
+        return pattern_source(self.pattern, self.flags)
 
     def __str__(self):
         return self.text
 
+    def __getstate__(self):
+        """Pickle regular expressions as strings: not all backends' compiled patterns can be pickled"""
+        state = {name: getattr(self, name) for name in self.__slots__}
+        flags = self.flags
+        state['pattern'] = self.text
+        state['negates'] = [(pattern_source(pat, flags), direction) for pat, direction in self.negates]
+        state['requires'] = [(pattern_source(pat, flags), direction) for pat, direction in self.requires]
+        state['requires_all'] = [pattern_source(pat, flags) for pat in self.requires_all]
+        return state
+
+    def __setstate__(self, state):
+        """Recompile with the same backend (e.g., in a worker process), reusing any already compiled"""
+        flags, backend = state['flags'], state['backend']
+        state['pattern'] = _compile(state['pattern'], flags, backend)
+        state['negates'] = [(_compile(rx, flags, backend), direction) for rx, direction in state['negates']]
+        state['requires'] = [(_compile(rx, flags, backend), direction) for rx, direction in state['requires']]
+        state['requires_all'] = [_compile(rx, flags, backend) for rx in state['requires_all']]
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @staticmethod
+    def union(*patterns: 'Pattern') -> Optional['UnionPattern']:
+        """Combine patterns into a single alternation to look for any of them in one pass
+
+        :param patterns:
+        :return: None if patterns cannot be combined (e.g., differing flags)
+        """
+        return _get_union(patterns)
+
     def _compile_patterns(self, both, pre, post, replace_whitespace, flags):
         for group, flag in [(both, DirectionFlag.BOTH), (pre, DirectionFlag.PRE),
                             (post, DirectionFlag.POST)]:
@@ -59,12 +130,11 @@ class Pattern:
 
     def _compile_pattern(self, group, replace_whitespace, flags, flag=None):
         for rx in group or []:
-            if replace_whitespace:
-                rx = replace_whitespace.join(rx.split(' '))
+            rx = _rewrite_pattern(rx, replace_whitespace)
             if flag:
-                yield re.compile(rx, flags), flag
+                yield _compile(rx, flags, self.backend), flag
             else:
-                yield re.compile(rx, flags)
+                yield _compile(rx, flags, self.backend)
 
     def _get_text_for_direction(self, text, direction, match_start, match_end):
         if direction == DirectionFlag.BOTH:
@@ -74,25 +144,60 @@ class Pattern:
         elif direction == DirectionFlag.POST:
             return text[match_end:]
 
+    def _search_direction(self, pat, text, direction, match_start, match_end):
+        """Search the text before/after the match"""
+        if direction == DirectionFlag.PRE:
+            # endpos behaves exactly like slicing off the end, but without copying the text
+            #   (unlike pos, which still allows lookbehinds/anchors to see the text before it)
+            return pat.search(text, 0, match_start)
+        return pat.search(self._get_text_for_direction(text, direction, match_start, match_end))
+
+    @staticmethod
+    def _search_both_directions(patterns, text):
+        """First match of those patterns which do not depend on location of the match"""
+        for pat, direction in patterns:
+            if direction == DirectionFlag.BOTH and (m := pat.search(text)):
+                return m
+        return None
+
     def _confirm_match(self, text, match_start, match_end, return_negation=False,
                        ignore_negation=False,
-                       ignore_requires=False, ignore_requires_all=False):
+                       ignore_requires=False, ignore_requires_all=False, cache=None):
+        """
+
+        :param cache: dict to retain results which do not depend on location of the match,
+            and so can be shared by all matches in the same text
+        """
+        if cache is None:
+            cache = {}
         if not ignore_negation:
+            if 'negates' not in cache:
+                cache['negates'] = self._search_both_directions(self.negates, text)
+            if neg_match := cache['negates']:
+                return neg_match if return_negation else False
             for negate, direction in self.negates:
-                if neg_match := negate.search(self._get_text_for_direction(text, direction, match_start, match_end)):
+                if direction == DirectionFlag.BOTH:
+                    continue
+                if neg_match := self._search_direction(negate, text, direction, match_start, match_end):
                     return neg_match if return_negation else False
         if not ignore_requires and self.requires:
-            found = False
-            for require, direction in self.requires:
-                if require.search(self._get_text_for_direction(text, direction, match_start, match_end)):
-                    found = True
-                    break
+            if 'requires' not in cache:
+                cache['requires'] = self._search_both_directions(self.requires, text) is not None
+            found = cache['requires']
+            if not found:
+                for require, direction in self.requires:
+                    if direction == DirectionFlag.BOTH:
+                        continue
+                    if self._search_direction(require, text, direction, match_start, match_end):
+                        found = True
+                        break
             if not found:
                 return False
         if not ignore_requires_all:
-            for require in self.requires_all:
-                if not require.search(text):
-                    return False
+            if 'requires_all' not in cache:
+                cache['requires_all'] = all(require.search(text) for require in self.requires_all)
+            if not cache['requires_all']:
+                return False
         return True
 
     def finditer(self, text, *, offset=0, return_negation=False, **kwargs):
@@ -105,14 +210,33 @@ class Pattern:
         :param kwargs:
         :return:
         """
-        for m in self.pattern.finditer(text):
-            cm = self._confirm_match(text, m.start() + offset, m.end() + offset,
-                                     return_negation=return_negation, **kwargs)
+        if (pos := self._find_start(text)) < 0:
+            return
+        cache = {}  # evaluate location-independent negation/requires only once
+        for m in self.pattern.finditer(text, pos):
+            # offset only applies to the reported match: confirmation searches within `text`
+            cm = self._confirm_match(text, m.start(), m.end(),
+                                     return_negation=return_negation, cache=cache, **kwargs)
             if not isinstance(cm, bool):
                 yield Negation(cm, m, offset=offset)
             elif cm:
                 self.match_count += 1
-                yield Match(m, groups=self._compress_groups(m), offset=offset)
+                yield Match(m, groups=self._compress_groups(m) if self.capture_length else None, offset=offset)
+
+    def count_in(self, text, **kwargs) -> int:
+        """Count matches; same as `len(list(self.finditer(text)))` without building matches
+
+        :param text:
+        :param kwargs: see `finditer` (e.g., ignore_negation)
+        :return: number of (confirmed) matches
+        """
+        if self.negates or self.requires or self.requires_all:
+            return sum(1 for _ in self.finditer(text, **kwargs))  # each needs confirmation
+        if (pos := self._find_start(text)) < 0:
+            return 0
+        count = sum(1 for _ in self.pattern.finditer(text, pos))
+        self.match_count += count
+        return count
 
     def matches(self, text, *, offset=0, return_negation=False, **kwargs):
         """Look for the first match -- this evaluation is at the sentence level.
@@ -123,27 +247,56 @@ class Pattern:
         :param kwargs:
         :return:
         """
-        m = self.pattern.search(text)
+        if (pos := self._find_start(text)) < 0:
+            return False
+        m = self.pattern.search(text, pos)
         if m:
             cm = self._confirm_match(text, m.start(), m.end(), return_negation=return_negation, **kwargs)
             if cm is False:
                 return False
             elif cm is True:
                 self.match_count += 1
-                return Match(m, groups=self._compress_groups(m), offset=offset)
+                return Match(m, groups=self._compress_groups(m) if self.capture_length else None, offset=offset)
             else:  # Negation requested
                 return Negation(cm, m)
         return False
 
+    def _find_start(self, text) -> int:
+        """Position of first possible match in text (or -1 if none) from which to start searching"""
+        if self._ascii_literal is None or not text.isascii():
+            return 0
+        return text.lower().find(self._ascii_literal)
+
+    def may_match(self, folded_text):
+        """Quickly rule out text which does not contain any of this pattern's literals
+
+        :param folded_text: case-folded text (see `runrex.algo.analysis.fold`)
+        :return: False if text cannot match
+        """
+        return not self.literals or any(literal in folded_text for literal in self.literals)
+
+    def prescan(self, text, pos=0):
+        """Look for all unconfirmed matches in a larger body of text (e.g., document)
+
+        A substring of `text` (bounded by non-word characters) can only match this
+            pattern if it overlaps one of these matches.
+
+        :param text:
+        :param pos: start scanning here; substrings before `pos` cannot be ruled out
+        :return: iterator of matches; None if this pattern depends on context (e.g., anchors)
+            and cannot be used to rule out substrings
+        """
+        if not self._context_free:
+            return None
+        return self.pattern.finditer(text, pos)
+
     def _compress_groups(self, m):
         if self.capture_length:
             groups = m.groups()
             assert len(groups) % self.capture_length == 0
-            for x in zip(*[iter(m.groups())] * self.capture_length):
-                if x[0] is None:
-                    continue
-                else:
-                    return x
+            for i in range(0, len(groups), self.capture_length):
+                if groups[i] is not None:
+                    return groups[i:i + self.capture_length]
 
     def matchgroup(self, text, index=0):
         m = self.matches(text)
@@ -160,3 +313,71 @@ class Pattern:
             self.match_count += 1
             return text[m.end():]
         return text
+
+
+class UnionPattern:
+
+    def __init__(self, patterns: Iterable[Pattern]):
+        """
+        Alternation of several patterns, searched in a single pass. Matches are neither
+            confirmed (e.g., for negation) nor guaranteed to include every pattern's match
+            at a particular location, so this is primarily useful to rule out text.
+        :param patterns: must share the same flags and backend
+        """
+        self.patterns = list(patterns)
+        self._groups = [f'_p{i}' for i in range(len(self.patterns))]
+        self.pattern = compile_pattern(
+            '|'.join(f'(?P<{group}>{pat.text})' for group, pat in zip(self._groups, self.patterns)),
+            self.patterns[0].flags, self.patterns[0].backend
+        )
+        self._context_free = all(pat._context_free for pat in self.patterns)
+
+    def _index(self, m):
+        name = getattr(m, 'lastgroup', None)
+        if name and name.startswith('_p'):  # the pattern's group encloses (and so closes after) its own groups
+            return int(name[2:])
+        for i, group in enumerate(self._groups):
+            if m.group(group) is not None:
+                return i
+
+    def search(self, text):
+        """Look for the first match of any pattern
+
+        :param text:
+        :return: (index of pattern, match) or None
+        """
+        m = self.pattern.search(text)
+        if m:
+            return self._index(m), m
+        return None
+
+    def finditer(self, text):
+        """Look for all (non-overlapping) matches of any pattern
+
+        :param text:
+        :return: iterator of (index of pattern, match)
+        """
+        for m in self.pattern.finditer(text):
+            yield self._index(m), m
+
+    def prescan(self, text, pos=0):
+        """See `Pattern.prescan`"""
+        if not self._context_free:
+            return None
+        return self.pattern.finditer(text, pos)
+
+
+@lru_cache(maxsize=256)
+def _get_union(patterns):
+    if len(patterns) < 2:
+        return None
+    first = patterns[0]
+    for pat in patterns:
+        if pat.flags != first.flags or pat.backend != first.backend:
+            return None
+        if has_group_references(pat.text, pat.flags) or has_global_flags(pat.text, pat.flags):
+            return None
+    try:
+        return UnionPattern(patterns)
+    except re.error:  # e.g., duplicate group names
+        return None
@@ -0,0 +1,173 @@
+"""
+Search many patterns over the same text, using a single pass over the text
+    to rule out those patterns which cannot match.
+
+Uses a Hyperscan database if `hyperscan` is installed; otherwise, patterns are
+    ruled out by their required literals (see `runrex.algo.prefilter`).
+"""
+import re
+from typing import Iterable, Optional, Set
+
+from loguru import logger
+
+from runrex.algo.analysis import fold, parse, walk, sre_constants
+from runrex.algo.pattern import Pattern
+from runrex.algo.prefilter import LiteralFilter
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+def _to_hyperscan_flags(flags: int) -> Optional[int]:
+    """Hyperscan flags to prefilter a pattern compiled with `re` flags, or None if not possible"""
+    # prefilter: may report matches which `re` would not, but will not miss any
+    hs_flags = hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_ALLOWEMPTY
+    for flag, hs_flag in (
+            (re.IGNORECASE, hyperscan.HS_FLAG_CASELESS),
+            (re.MULTILINE, hyperscan.HS_FLAG_MULTILINE),
+            (re.DOTALL, hyperscan.HS_FLAG_DOTALL),
+    ):
+        if flags & flag:
+            hs_flags |= hs_flag
+            flags &= ~flag
+    if flags & ~re.UNICODE:  # e.g., re.VERBOSE
+        return None
+    return hs_flags
+
+
+# Python syntax which Hyperscan (PCRE syntax) reads differently: `{,n}` as literal text, `\N{...}` as any non-newline
+_PYTHON_ONLY_SYNTAX = re.compile(r'\{,|\\N\{')
+
+# `re` includes \x1c-\x1f in `\s`, but Hyperscan does not
+_SPACE_CATEGORIES = {sre_constants.CATEGORY_SPACE, sre_constants.CATEGORY_NOT_SPACE}
+
+
+# constructs which Hyperscan's prefilter mode approximates in ways that can drop real matches
+_UNSAFE_OPS = {sre_constants.ASSERT, sre_constants.ASSERT_NOT,  # lookarounds
+               sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS}  # backreferences
+_END_ANCHORS = {sre_constants.AT_END, sre_constants.AT_END_LINE, sre_constants.AT_END_STRING}
+
+
+def _is_ascii_class(items) -> bool:
+    for op, av in items:
+        if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL) and av >= 128:
+            return False
+        if op == sre_constants.RANGE and av[1] >= 128:
+            return False
+        if op == sre_constants.CATEGORY and av in _SPACE_CATEGORIES:
+            return False
+    return True
+
+
+def _is_hyperscan_compatible(pattern: str, flags: int) -> bool:
+    """
+    Whether Hyperscan will find every match `re` finds in ASCII text. Non-ASCII characters
+        may match ASCII with `re.IGNORECASE` (e.g., the Kelvin sign matches 'k'), and
+        Hyperscan's prefilter can miss matches of end anchors (`$`, `\\Z`), lookarounds and
+        backreferences, so these are left to `re`.
+    """
+    if not pattern.isascii() or _PYTHON_ONLY_SYNTAX.search(pattern):
+        return False
+    tree = parse(pattern, flags)
+    if tree is None:
+        return False
+    for op, av in walk(tree):
+        if op in _UNSAFE_OPS or (op == sre_constants.AT and av in _END_ANCHORS):
+            return False
+        if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL) and av >= 128:  # e.g., \u0130
+            return False
+        if op == sre_constants.IN and not _is_ascii_class(av):
+            return False
+    return True
+
+
+def _compile_database(expressions, ids, flags):
+    db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    db.compile(expressions=expressions, ids=ids, elements=len(expressions), flags=flags)
+    return db
+
+
+def _on_match(pattern_id, start, end, flags, context):
+    context.add(pattern_id)
+
+
+class PatternSet:
+
+    def __init__(self, patterns: Iterable[Pattern]):
+        """
+        Collection of patterns to be searched together (e.g., all patterns used by an algorithm).
+        :param patterns:
+        """
+        self.patterns = list(patterns)
+        self._literal_filter = LiteralFilter(self.patterns)
+        self._database = None
+        self._unsupported = set()  # patterns which the database cannot rule out
+        if hyperscan:
+            self._database = self._build_database()
+
+    def _build_database(self):
+        expressions = {}
+        for i, pat in enumerate(self.patterns):
+            hs_flags = _to_hyperscan_flags(pat.flags)
+            if (hs_flags is None
+                    or not isinstance(pat.pattern, re.Pattern)  # other engines' syntax, e.g., `regex`
+                    or not _is_hyperscan_compatible(pat.text, pat.flags)):
+                self._unsupported.add(i)
+            else:
+                expressions[i] = (pat.text.encode('utf8'), hs_flags)
+        if not expressions:
+            return None
+        try:
+            return _compile_database(*self._unzip(expressions))
+        except hyperscan.error:
+            pass
+        # find the pattern(s) with syntax hyperscan does not support
+        for i, (expression, hs_flags) in list(expressions.items()):
+            try:
+                _compile_database([expression], [i], [hs_flags])
+            except hyperscan.error:
+                logger.debug(f'Pattern not supported by hyperscan: {self.patterns[i].text}')
+                self._unsupported.add(i)
+                del expressions[i]
+        if not expressions:
+            return None
+        return _compile_database(*self._unzip(expressions))
+
+    @staticmethod
+    def _unzip(expressions):
+        ids = list(expressions)
+        return [expressions[i][0] for i in ids], ids, [expressions[i][1] for i in ids]
+
+    @property
+    def scans_bytes(self) -> bool:
+        """Whether `candidates` can make use of encoded text"""
+        return self._database is not None
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def __iter__(self):
+        return iter(self.patterns)
+
+    def __getitem__(self, item):
+        return self.patterns[item]
+
+    def candidates(self, text: str, folded_text: str = None, encoded_text: bytes = None) -> Set[int]:
+        """
+        Get patterns which might match text. These still need to be confirmed by
+            searching with the pattern (e.g., to apply negation).
+        :param text:
+        :param folded_text: case-folded text, if already available (see `runrex.algo.analysis.fold`)
+        :param encoded_text: UTF-8 encoded text, if already available
+        :return: indices of patterns which cannot be ruled out
+        """
+        # hyperscan's case-insensitivity and character classes only agree with `re` for ASCII
+        if self._database is None or not text.isascii():
+            return self._literal_filter.candidates(folded_text if folded_text is not None else fold(text))
+        found = set(self._unsupported)
+        if encoded_text is None:
+            encoded_text = text.encode('utf8')
+        self._database.scan(encoded_text, match_event_handler=_on_match, context=found)
+        return found
@@ -0,0 +1,57 @@
+"""
+Rule out patterns for a piece of text by looking for the literal strings
+    which every match must contain (see `Pattern.literals`).
+"""
+from functools import lru_cache
+from typing import Iterable, Set
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class LiteralFilter:
+
+    def __init__(self, patterns: Iterable):
+        """
+        Find all patterns' literals in a single pass over the text. Uses an
+            Aho-Corasick automaton if `pyahocorasick` is installed.
+        :param patterns: `Pattern` instances
+        """
+        self.patterns = list(patterns)
+        self._always = set()  # patterns without literals cannot be ruled out
+        self._literals = {}  # literal -> indices of patterns
+        for i, pat in enumerate(self.patterns):
+            if pat.literals:
+                for literal in pat.literals:
+                    self._literals.setdefault(literal, set()).add(i)
+            else:
+                self._always.add(i)
+        self._automaton = None
+        if ahocorasick and self._literals:
+            self._automaton = ahocorasick.Automaton()
+            for literal, indices in self._literals.items():
+                self._automaton.add_word(literal, indices)
+            self._automaton.make_automaton()
+
+    def candidates(self, folded_text: str) -> Set[int]:
+        """
+        Get patterns which might match text
+        :param folded_text: case-folded text (see `runrex.algo.analysis.fold`)
+        :return: indices of patterns which cannot be ruled out
+        """
+        found = set(self._always)
+        if self._automaton:
+            for _, indices in self._automaton.iter(folded_text):
+                found |= indices
+        else:
+            for literal, indices in self._literals.items():
+                if literal in folded_text:
+                    found |= indices
+        return found
+
+
+@lru_cache(maxsize=256)
+def get_literal_filter(patterns: tuple) -> LiteralFilter:
+    return LiteralFilter(patterns)
@@ -18,6 +18,13 @@ except ModuleNotFoundError:
 
     logger.basicConfig(level=logger.DEBUG)
 
+try:
+    from orjson import loads as json_loads
+except ModuleNotFoundError:
+    json_loads = json.loads
+
+BATCH_SIZE = 1000  # number of rows to buffer before writing
+
 
 def create_table(tablename, eng):
     Base = declarative_base()
@@ -46,8 +53,10 @@ def create_table(tablename, eng):
             For use in CSV file, etc.
             :return:
             """
-            return tuple(getattr(self, x) for x in dir(self) if not x.startswith('_') and x != 'metadata')
+            return tuple(getattr(self, x) for x in self._columns)
 
+    # alphabetical, as previously retrieved from `dir`
+    Table._columns = tuple(sorted(col.name for col in Table.__table__.columns))
     Base.metadata.create_all(eng)
     return Table
 
@@ -125,25 +134,6 @@ def get_data(version, data, name, counter, corpus_path, corpus_suffix):
         raise ValueError(f'Expected version: pytakes or runrex, got {version}')
 
 
-def get_pytakes_entry(Entry, data, name, counter, corpus_path, corpus_suffix):
-    """Get database entry for pytakes file"""
-    return Entry(**get_pytakes_data(data, name, counter, corpus_path, corpus_suffix))
-
-
-def get_runrex_entry(Entry, data, name, counter, corpus_path, corpus_suffix):
-    """Get database entry for runrex file"""
-    return Entry(**get_runrex_data(data, name, counter, corpus_path, corpus_suffix))
-
-
-def get_entry(version, Entry, data, name, counter, corpus_path, corpus_suffix):
-    if version == 'runrex':
-        return get_runrex_entry(Entry, data, name, counter, corpus_path, corpus_suffix)
-    elif version == 'pytakes':
-        return get_pytakes_entry(Entry, data, name, counter, corpus_path, corpus_suffix)
-    else:
-        raise ValueError(f'Expected version: pytakes or runrex, got {version}')
-
-
 def get_csv_header(version):
     if version == 'runrex':
         return ['doc_id', 'source', 'algorithm', 'category', 'start_idx', 'end_idx',
@@ -170,17 +160,23 @@ def write_to_file(file: pathlib.Path, version, output_directory=None, corpus_pat
     logger.info(f'Starting extraction of {file} to {outfile}')
 
     i = 0
+    header = get_csv_header(version)
     with open(outfile, 'w', newline='') as out:
-        writer = csv.DictWriter(out, fieldnames=get_csv_header(version))
-        writer.writeheader()
+        writer = csv.writer(out)
+        writer.writerow(header)
+        batch = []
         with open(file) as fh:
             for i, line in enumerate(fh, start=1):
-                data = json.loads(line)
+                data = json_loads(line)
                 row = get_data(version, data, name, counter, corpus_path, corpus_suffix)
-                writer.writerow(row)
+                batch.append([row[col] for col in header])
                 doc_ids.add(row['doc_id'])
+                if len(batch) >= BATCH_SIZE:
+                    writer.writerows(batch)
+                    batch.clear()
                 if i % 100 == 0:
                     logger.info(f'Completed upload of {i} lines')
+        writer.writerows(batch)
     logger.info(f'Completed upload of {i} lines.')
     output_stats(file, len(doc_ids), counter)
     logger.info('Done')
@@ -208,15 +204,22 @@ def write_to_database(file: pathlib.Path, version, connection_string, corpus_pat
     logger.info(f'Starting upload of {file}')
 
     i = 0
+    columns = set(Entry.__table__.columns.keys())  # data also includes pre/post context
+    batch = []
     with open(file) as fh:
         for i, line in enumerate(fh, start=1):
-            data = json.loads(line)
-            e = get_entry(version, Entry, data, name, counter, corpus_path, corpus_suffix)
-            doc_ids.add(e.doc_id)
-            session.add(e)
-            session.commit()
-            if i % 100 == 0:
+            data = json_loads(line)
+            row = get_data(version, data, name, counter, corpus_path, corpus_suffix)
+            doc_ids.add(row['doc_id'])
+            batch.append({key: value for key, value in row.items() if key in columns})
+            if len(batch) >= BATCH_SIZE:
+                session.bulk_insert_mappings(Entry, batch)
+                session.commit()
+                batch.clear()
                 logger.info(f'Completed upload of {i} lines')
+    if batch:
+        session.bulk_insert_mappings(Entry, batch)
+        session.commit()
     logger.info(f'Completed upload of {i} lines.')
     output_stats(file, len(doc_ids), counter)
     logger.info('Done')
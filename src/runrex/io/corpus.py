@@ -3,6 +3,7 @@ import itertools
 import os
 
 from runrex.io import sqlai
+from runrex.io.utils import read_text
 from runrex.text.document import Document
 
 
@@ -38,8 +39,7 @@ def _get_next_from_directory(directory, encoding, filenames, version):
         for file in filenames:
             fp = os.path.join(corpus_dir, file)
             try:
-                with open(fp, encoding=encoding) as fh:
-                    text = fh.read()
+                text = read_text(fp, encoding)
             except FileNotFoundError:
                 continue
             else:
@@ -50,8 +50,7 @@ def _get_next_from_directory(directory, encoding, filenames, version):
                 doc_name = '.'.join(entry.name.split('.')[:-1])
             else:
                 doc_name = entry.name
-            with open(entry.path, encoding=encoding) as fh:
-                text = fh.read()
+            text = read_text(entry.path, encoding)
             if not text:
                 continue
             yield doc_name, None, text
@@ -81,6 +80,31 @@ def get_next_from_sql(name=None, driver=None, server=None,
         yield from _get_next_from_file(name, name_col=name_col, text_col=text_col, encoding=encoding)
 
 
+def iter_corpus(directory=None, directories=None, version=None,
+                connections=None, skipper=None, start=0, end=None,
+                filenames=None, encoding='utf8'):
+    """
+    Same as `get_next_from_corpus`, but without building documents (e.g., to
+        build them in another process)
+    :return: iterator yielding (document name, path, text); one of path or text is set
+    """
+    i = -1
+    for doc_name, path, text in itertools.chain(
+            get_next_from_directory(directory, directories, version, filenames, encoding),
+            get_next_from_connections(*connections or list())
+    ):
+        if skipper and doc_name in skipper:
+            continue
+        i += 1
+        if i < start:
+            continue
+        elif end and i >= end:
+            break
+        if not text and not path:  # one of these required
+            continue
+        yield doc_name, path, text
+
+
 def get_next_from_corpus(directory=None, directories=None, version=None,
                          connections=None, skipper=None, start=0, end=None,
                          filenames=None, encoding='utf8', ssplit=None):
@@ -98,20 +122,8 @@ def get_next_from_corpus(directory=None, directories=None, version=None,
     :param end:
     :return: iterator yielding documents
     """
-    i = -1
-    for doc_name, path, text in itertools.chain(
-            get_next_from_directory(directory, directories, version, filenames, encoding),
-            get_next_from_connections(*connections or list())
-    ):
-        if skipper and doc_name in skipper:
-            continue
-        i += 1
-        if i < start:
-            continue
-        elif end and i >= end:
-            break
-        if not text and not path:  # one of these required
-            continue
+    for doc_name, path, text in iter_corpus(directory, directories, version, connections,
+                                            skipper, start, end, filenames, encoding):
         yield Document(doc_name, file=path, text=text, ssplit=ssplit)
 
 
@@ -22,15 +22,24 @@ def create_table(tablename, columns, eng):
 
 
 def format_data_as_dict(number, doc, algo_name, res):
+    return format_result_as_dict(number, doc.name, get_match_strings(doc), algo_name, res)
+
+
+def get_match_strings(doc):
+    """Text searched by each match in document; unlike the matches themselves, this can be pickled"""
+    return tuple(m.matchobj.string for m in doc.matches)
+
+
+def format_result_as_dict(number, name, matches, algo_name, res):
     d = {
         'id': number,
-        'name': doc.name,
+        'name': name,
         'algorithm': algo_name,
         'value': res.result,
         'category': res.value,
         'date': res.date,
         'extras': res.extras,
-        'matches': tuple(m.matchobj.string for m in doc.matches),
+        'matches': matches,
         'text': res.text,
         'start': res.start,
         'end': res.end,
@@ -21,3 +21,19 @@ def open_all(filename: Optional[str] = None, mode: str = 'r', *args, **kwargs):
                 fh.close()
             except AttributeError:
                 pass
+
+
+def read_text(path, encoding: str = 'utf8') -> str:
+    """
+    Read entire file as text with a single decode of its bytes; equivalent to
+        `open(path, encoding=encoding).read()`, but without the incremental
+        decoding and newline translation of a text-mode file
+    :param path: path to file
+    :param encoding:
+    :return: text with universal newlines (i.e., '\\r\\n' and '\\r' converted to '\\n')
+    """
+    with open(path, 'rb') as fh:
+        text = fh.read().decode(encoding)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
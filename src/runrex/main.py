@@ -1,11 +1,14 @@
+import itertools
 import logging
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
-from runrex.io.corpus import get_next_from_corpus, Skipper
-from runrex.io.formatter import format_data_as_dict
+from runrex.io.corpus import iter_corpus, Skipper
+from runrex.io.formatter import format_result_as_dict, get_match_strings
 from runrex.io.out import get_file_wrapper, get_logging
 from runrex.io.report import Reporter
 from runrex.schema import validate_config
+from runrex.text.document import Document
 from runrex.util import kw
 
 
@@ -26,8 +29,60 @@ def parse_annotation_files(*configs, data=None):
     return data
 
 
+def run_algorithms(doc, expected, algorithms):
+    """
+    Run all algorithms over a single document
+    :param doc: Document
+    :param expected: expected value for document from annotation file (or None)
+    :param algorithms: dict of name -> algorithm function
+    :return: (document name, [(algorithm name, [(result, matched text)])]) where each algorithm's
+        results end with the first 'skip' result (if any); contains only picklable objects
+    """
+    results = []
+    for alg_name, alg_func in algorithms.items():
+        alg_results = []
+        for res in alg_func(doc, expected):
+            # record matches now: the document accumulates these as the algorithm runs
+            alg_results.append((res, get_match_strings(doc)))
+            if not res and res.is_skip():
+                break
+        results.append((alg_name, alg_results))
+    return doc.name, results
+
+
+def run_document(doc_name, path, text, expected, algorithms, ssplit=None):
+    """Build the document (i.e., read, clean and split sentences) and run all algorithms over it"""
+    doc = Document(doc_name, file=path, text=text, ssplit=ssplit)
+    return run_algorithms(doc, expected, algorithms)
+
+
+def _run_document(args):
+    return run_document(*args)
+
+
+def iter_results(docs, truth, algorithms, workers=None, chunksize=16, ssplit=None):
+    """
+    Run algorithms over all documents, yielding results in the order of `docs`
+    :param docs: iterator of (document name, path, text) (see `iter_corpus`); documents
+        are built in the worker processes, so that reading and sentence splitting
+        also run in parallel
+    :param workers: number of processes to use; None or 1 to run in this process
+    :param chunksize: number of documents to send to a worker process at once
+    :param ssplit: sentence splitting function
+    """
+    args = ((doc_name, path, text, truth[doc_name], algorithms, ssplit) for doc_name, path, text in docs)
+    if not workers or workers <= 1:
+        yield from map(_run_document, args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        # submit a bounded batch at a time so that the corpus is not read into memory all at once
+        while batch := list(itertools.islice(args, workers * chunksize)):
+            yield from ex.map(_run_document, batch, chunksize=chunksize)
+
+
 def process(corpus=None, annotation=None, annotations=None, output=None, select=None,
-            algorithms=None, loginfo=None, skipinfo=None, logger=None, ssplit=None):
+            algorithms=None, loginfo=None, skipinfo=None, logger=None, ssplit=None,
+            workers=None):
     """
 
     :param corpus:
@@ -39,6 +94,8 @@ def process(corpus=None, annotation=None, annotations=None, output=None, select=
     :param loginfo:
     :param skipinfo:
     :param logger:
+    :param workers: number of processes to run algorithms in; algorithms, `ssplit`
+        and results must be picklable (e.g., importable functions)
     :return:
     """
     if logger and not logger['verbose']:
@@ -54,19 +111,20 @@ def process(corpus=None, annotation=None, annotations=None, output=None, select=
     with get_file_wrapper(**output) as out, \
             get_logging(**kw(loginfo)) as log, \
             Skipper(**kw(skipinfo)) as skipper:
-        for i, doc in enumerate(get_next_from_corpus(**kw(corpus), **kw(select),
-                                                     skipper=skipper, ssplit=ssplit)):
-            for alg_name, alg_func in algorithms.items():
+        docs = iter_corpus(**kw(corpus), **kw(select), skipper=skipper)
+        for i, (doc_name, doc_results) in enumerate(iter_results(docs, truth, algorithms, workers,
+                                                                 ssplit=ssplit)):
+            for alg_name, alg_results in doc_results:
                 max_res = None
-                for res in alg_func(doc, truth[doc.name]):
+                for res, matches in alg_results:
                     if res:
-                        logging.debug(f'{i}: {doc.name}: {res}')
-                        out.writeline(format_data_as_dict(number_id, doc, alg_name, res))
+                        logging.debug(f'{i}: {doc_name}: {res}')
+                        out.writeline(format_result_as_dict(number_id, doc_name, matches, alg_name, res))
                         number_id += 1
                     elif res.is_skip():  # always skip
-                        skipper.add(doc.name)
+                        skipper.add(doc_name)
                         break
-                    log.writeline(format_data_as_dict(None, doc, alg_name, res))
+                    log.writeline(format_result_as_dict(None, doc_name, matches, alg_name, res))
                     # only take max
                     if not max_res or res.result > max_res.result:
                         max_res = res
@@ -74,7 +132,7 @@ def process(corpus=None, annotation=None, annotations=None, output=None, select=
                     if max_res is not None:
                         results[alg_name].update(max_res)
                         if max_res.expected is not None:
-                            logging.info(f'Validation for {doc.name}: {results}')
+                            logging.info(f'Validation for {doc_name}: {results}')
     logging.warning(f'Final results: {results}')
 
 
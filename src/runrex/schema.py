@@ -104,7 +104,8 @@ JSON_SCHEMA = {
             'properties': {
                 'verbose': {'type': 'boolean'}
             }
-        }
+        },
+        'workers': {'type': 'integer'},  # number of processes
     }
 }
 
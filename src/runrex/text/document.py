@@ -2,6 +2,7 @@ import re
 from typing import Iterable, List, Optional, Iterator
 
 from runrex.algo import MatchCask
+from runrex.io.utils import read_text
 from runrex.text.section import Section
 from runrex.text.sections import Sections
 from runrex.text.sentence import Sentence
@@ -11,6 +12,7 @@ from runrex.text.ssplit import default_ssplit
 
 class Document:
     HISTORY_REMOVAL = re.compile(r'HISTORY:.*?(?=[A-Z]+:)')
+    COLON_NEWLINE = re.compile(r': *\n', re.I)
 
     def __init__(self, name, file=None, text=None, encoding='utf8', ssplit=default_ssplit):
         """
@@ -24,8 +26,7 @@ class Document:
         self.text = text
         self.matches = MatchCask()
         if file:
-            with open(file, encoding=encoding) as fh:
-                self.text = fh.read()
+            self.text = read_text(file, encoding)
         if not self.text:
             raise ValueError(f'Missing text for {name}, file: {file}')
         # remove history section
@@ -34,7 +35,7 @@ class Document:
 
     @classmethod
     def clean_text(cls, text, ssplit=default_ssplit):
-        return re.sub(r': *\n', r': ', Document.HISTORY_REMOVAL.sub('\n', text), flags=re.I)
+        return Document.COLON_NEWLINE.sub(': ', Document.HISTORY_REMOVAL.sub('\n', text))
 
     def _clean_text(self, text):
         """
@@ -43,8 +44,7 @@ class Document:
         :param text:
         :return:
         """
-        text = re.sub(r': *\n', r': ', text, flags=re.I)
-        return text
+        return self.COLON_NEWLINE.sub(': ', text)
 
     def remove_patterns(self, *pats, ignore_negation=False):
         text = self.text
@@ -131,20 +131,14 @@ class Document:
 
     def select_sentences_with_patterns(self, *pats, negation=None, has_all=False,
                                        neighboring_sentences=0) -> Iterable[Section]:
+        # neighbors are `i - j` and `i + j` for j < neighboring_sentences: a contiguous range
+        span = max(neighboring_sentences, 1)
         for i, sentence in enumerate(self.sentences):
-            sents = set()
             if sentence.has_patterns(*pats, has_all=has_all):
                 if negation:
                     if sentence.has_patterns(*negation):
                         continue
-                sents.add(i)
-                for j in range(neighboring_sentences):
-                    if i + j < len(self.sentences):
-                        sents.add(i + j)
-                    if i - j >= 0:
-                        sents.add(i - j)
-            if sents:
-                yield Section([self.sentences[i] for i in sorted(list(sents))], self.matches)
+                yield Section(self.sentences[max(i - span + 1, 0): i + span], self.matches)
 
     def select_all_sentences_with_patterns(self, *pats, negation=None, has_all=False, get_range=False,
                                            neighboring_sentences=0) -> Optional[Section]:
@@ -1,5 +1,5 @@
 from runrex.text.section import Section
-from runrex.text.sentence import Sentence
+from runrex.text.sentence import iter_sentences
 from runrex.text.ssplit import default_ssplit
 
 
@@ -9,9 +9,7 @@ class Sections:
         self.sections = {}
 
     def add(self, name, text, ssplit=default_ssplit):
-        self.sections[name.upper()] = Section(
-            [Sentence(s, start=sidx, end=eidx) for s, sidx, eidx in ssplit(text) if s.strip()]
-        )
+        self.sections[name.upper()] = Section(list(iter_sentences(ssplit(text))))
 
     def get_sections(self, *names) -> Section:
         sect = Section([])
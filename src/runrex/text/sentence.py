@@ -1,16 +1,32 @@
-from typing import Tuple
+from typing import Iterable, Iterator, Tuple
 
-from runrex.algo import MatchCask, Pattern, Negation
+from runrex.algo import Match, MatchCask, Pattern, Negation, PatternSet
+from runrex.algo.analysis import fold
+from runrex.algo.pattern import UnionPattern
+from runrex.algo.prefilter import get_literal_filter
 
 
 class Sentence:
 
-    def __init__(self, text, mc: MatchCask = None, start=0, end=None):
+    __slots__ = ['text', 'matches', 'start', 'end', '_folded_text', '_encoded_text', '_last_search_found_pattern']
+
+    def __init__(self, text, mc: MatchCask = None, start=0, end=None, *, strip=True):
+        """
+
+        :param text:
+        :param mc:
+        :param start: offset of text in document
+        :param end: end offset of text in document
+        :param strip: set to False if text (and offsets) have already been stripped
+        """
         self.text = text
         self.matches = mc or MatchCask()
         self.start = start
         self.end = end if end else len(self.text)
-        self.strip()  # remove extra start/ending characters
+        self._folded_text = None
+        self._encoded_text = None
+        if strip:
+            self.strip()  # remove extra start/ending characters
         self._last_search_found_pattern = []
 
     def reset_found_pattern(self):
@@ -35,11 +51,30 @@ class Sentence:
         rtext = ltext.rstrip()
         self.end -= len(self.text) - len(rtext) - start_incr
         self.text = rtext
+        self._folded_text = None
+        self._encoded_text = None
+
+    @property
+    def folded_text(self):
+        """Case-folded text, for finding literals regardless of case"""
+        if self._folded_text is None:
+            self._folded_text = fold(self.text)
+        return self._folded_text
+
+    @property
+    def encoded_text(self):
+        """UTF-8 encoded text, for engines which search bytes (e.g., hyperscan)"""
+        if self._encoded_text is None:
+            self._encoded_text = self.text.encode('utf8')
+        return self._encoded_text
 
     def _update_last_search(self, val: bool):
         self._last_search_found_pattern.append(val)
 
     def has_pattern(self, pat: Pattern, ignore_negation=False):
+        if not pat.may_match(self.folded_text):
+            self._update_last_search(False)
+            return False
         m = pat.matches(self.text, ignore_negation=ignore_negation, offset=self.start)
         self._update_last_search(bool(m))
         if m:
@@ -47,11 +82,22 @@ class Sentence:
         return m
 
     def has_patterns(self, *pats, has_all=False, ignore_negation=False):
-        for pat in pats:
-            if has_all and not self.has_pattern(pat, ignore_negation=ignore_negation):
+        if not has_all and (union := Pattern.union(*pats)) and not union.search(self.text):
+            # none can match: record the same as searching each pattern
+            self._last_search_found_pattern += [False] * (len(pats) + 1)
+            return False
+        # rule out patterns whose literals are absent
+        candidates = get_literal_filter(pats).candidates(self.folded_text) if len(pats) > 1 else range(len(pats))
+        for i, pat in enumerate(pats):
+            if i in candidates:
+                m = self.has_pattern(pat, ignore_negation=ignore_negation)
+            else:
+                m = False
+                self._update_last_search(False)  # same record as an unsuccessful search
+            if has_all and not m:
                 self._update_last_search(False)
                 return False
-            elif not has_all and self.has_pattern(pat, ignore_negation=ignore_negation):
+            elif not has_all and m:
                 self._update_last_search(True)
                 return True
         self._update_last_search(has_all)
@@ -67,6 +113,9 @@ class Sentence:
         :param get_indices: to maintain backward compatibility
         :return:
         """
+        if not pat.may_match(self.folded_text):
+            self._update_last_search(False)
+            return None
         # incorporate offset information
         m = pat.matches(self.text, offset=self.start, return_negation=return_negation)
         self._update_last_search(bool(m))
@@ -89,13 +138,113 @@ class Sentence:
         :param index: group index (if using particular regex match group)
         :return:
         """
+        for m in self._iter_matches(pats, return_negation=return_negation):
+            if return_negation:
+                yield m.group(index), m.start(index), m.end(index), isinstance(m, Negation)
+            else:
+                yield m.group(index), m.start(index), m.end(index)
+
+    def get_pattern_spans(self, *pats: Pattern, index=0) -> Tuple[int, int]:
+        """
+        Same as `get_patterns`, but without copying out the matched text
+
+        :param pats:
+        :param index: group index (if using particular regex match group)
+        :return: (start, end)
+        """
+        for m in self._iter_matches(pats):
+            yield m.start(index), m.end(index)
+
+    def get_combined(self, union: UnionPattern, *, return_negation=False) -> Tuple[int, str, int, int]:
+        """
+        Find matches of any of the patterns in a single pass. Unlike `get_patterns`, matches
+            do not overlap: where several patterns match at the same location, only the
+            first of these patterns is reported.
+
+        :param union: combined patterns (see `Pattern.union`)
+        :param return_negation: if True return Negation instance rather than ignoring negation
+        :return: (index of pattern in `union.patterns`, text, start, end)
+        """
         found = False
+        caches = {}  # location-independent negation/requires for each pattern
+        for i, m in union.finditer(self.text):
+            pat = union.patterns[i]
+            cm = pat._confirm_match(self.text, m.start(), m.end(), return_negation=return_negation,
+                                    cache=caches.setdefault(i, {}))
+            if cm is False:
+                continue
+            found = True
+            if cm is True:
+                pat.match_count += 1
+                match = Match(m, offset=self.start)
+            else:  # Negation requested
+                match = Negation(cm, m, offset=self.start)
+            self.matches.add(match)
+            if return_negation:
+                yield i, match.group(), match.start(), match.end(), isinstance(match, Negation)
+            else:
+                yield i, match.group(), match.start(), match.end()
+        self._update_last_search(found)
+
+    def count_patterns(self, *pats: Pattern, ignore_negation=False) -> int:
+        """
+        Count matches of all patterns (unlike `get_patterns`, matches are not recorded)
+
+        :param pats:
+        :param ignore_negation:
+        :return: number of matches
+        """
+        count = 0
         for pat in pats:
+            if pat.may_match(self.folded_text):
+                count += pat.count_in(self.text, ignore_negation=ignore_negation)
+        self._update_last_search(count > 0)
+        return count
+
+    def _iter_matches(self, pats, return_negation=False):
+        found = False
+        for pat in pats:
+            if not pat.may_match(self.folded_text):
+                continue
             for m in pat.finditer(self.text, offset=self.start, return_negation=return_negation):
+                found = True
+                self.matches.add(m)
+                yield m
+        self._update_last_search(found)
+
+    def get_all_patterns(self, pset: PatternSet, *, index=0, return_negation=False) -> Tuple[int, str, int, int]:
+        """
+        Find all matches of all patterns in the set, ruling out patterns in a single pass
+
+        :param pset: patterns to search for
+        :param index: group index (if using particular regex match group)
+        :param return_negation: if True return Negation instance rather than ignoring negation
+        :return: (index of pattern in `pset`, group, start, end)
+        """
+        found = False
+        encoded_text = self.encoded_text if pset.scans_bytes else None
+        for i in sorted(pset.candidates(self.text, self.folded_text, encoded_text)):
+            for m in pset[i].finditer(self.text, offset=self.start, return_negation=return_negation):
                 found = True
                 self.matches.add(m)
                 if return_negation:
-                    yield m.group(index), m.start(index), m.end(index), isinstance(m, Negation)
+                    yield i, m.group(index), m.start(index), m.end(index), isinstance(m, Negation)
                 else:
-                    yield m.group(index), m.start(index), m.end(index)
+                    yield i, m.group(index), m.start(index), m.end(index)
         self._update_last_search(found)
+
+
+def iter_sentences(split: Iterable[Tuple[str, int, int]], mc: MatchCask = None) -> Iterator[Sentence]:
+    """
+    Build stripped sentences from the output of a sentence splitter, skipping those which are empty.
+    :param split: (text, start, end) as yielded by, e.g., `runrex.text.ssplit.default_ssplit`
+    :param mc:
+    :return:
+    """
+    for text, start, end in split:
+        ltext = text.lstrip()
+        rtext = ltext.rstrip()
+        if not rtext:
+            continue
+        end = end if end else len(text)
+        yield Sentence(rtext, mc, start + len(text) - len(ltext), end - (len(ltext) - len(rtext)), strip=False)
@@ -1,22 +1,140 @@
-from typing import Iterator
+import itertools
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
 
-from runrex.algo import Pattern
-from runrex.text.sentence import Sentence
+from runrex.algo import Pattern, PatternSet
+from runrex.algo.pattern import UnionPattern
+from runrex.text.sentence import Sentence, iter_sentences
 from runrex.text.ssplit import default_ssplit
 
 
+_WORD_CHAR = re.compile(r'\w')
+
+
 class Sentences:
 
+    __slots__ = ['text', '_sentences', '_splitter', '_texts', '_aligned', '_aligned_end']
+
     def __init__(self, text, matches=None, ssplit=default_ssplit):
-        self.sentences = [Sentence(s, matches, sidx, eidx) for s, sidx, eidx in ssplit(text) if s.strip()]
+        """
+        Sentences are split from `text` as they are needed, so that a search can stop
+            at the first match without splitting the rest of the text.
+        :param text:
+        :param matches: MatchCask to record matches
+        :param ssplit: sentence splitting function
+        """
+        self.text = text
+        self._sentences = []  # sentences split so far
+        self._splitter = iter_sentences(ssplit(text), matches)  # None once all sentences are split
+        # repeated sentences (e.g., templated text) share a single string
+        self._texts = {}
+        self._aligned = []
+        self._aligned_end = 0  # end of last aligned sentence
+
+    @property
+    def sentences(self) -> List[Sentence]:
+        """All sentences (i.e., finish splitting text)"""
+        while self._split_next() is not None:
+            pass
+        return self._sentences
+
+    def _split_next(self) -> Optional[Sentence]:
+        """Split the next sentence from text, or None if there are no more"""
+        if self._splitter is None:
+            return None
+        sentence = next(self._splitter, None)
+        if sentence is None:
+            self._splitter = None
+            self._texts = None
+            return None
+        sentence.text = self._texts.setdefault(sentence.text, sentence.text)
+        self._sentences.append(sentence)
+        return sentence
+
+    def __getstate__(self):
+        """Pickle split sentences rather than the (unpicklable) splitting generator"""
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state['_sentences'] = self.sentences
+        state['_splitter'] = None
+        state['_texts'] = None
+        return None, state  # no __dict__: restore as slots
+
+    def _is_boundary(self, idx):
+        return idx < 0 or idx >= len(self.text) or not _WORD_CHAR.match(self.text, idx)
+
+    def _is_aligned(self, sentence: Sentence) -> bool:
+        """
+        Sentences whose text can be found at their offsets in the full text (and which are
+            bounded by non-word characters) can be ruled out by scanning the full text.
+        Other sentence splitters (e.g., normalizing whitespace) may not retain this alignment.
+        """
+        aligned = (
+                sentence.start >= self._aligned_end
+                and sentence.end - sentence.start == len(sentence.text)
+                and self.text.startswith(sentence.text, sentence.start)
+                and self._is_boundary(sentence.start - 1)
+                and self._is_boundary(sentence.end)
+        )
+        if aligned:
+            self._aligned_end = sentence.end
+        return aligned
+
+    def _iter_alignment(self) -> Iterator[Tuple[Sentence, bool]]:
+        """Each sentence with whether it is aligned (see `_is_aligned`)"""
+        for i, sentence in enumerate(self):
+            if i == len(self._aligned):
+                self._aligned.append(self._is_aligned(sentence))
+            yield sentence, self._aligned[i]
+
+    def _iter_candidates(self, pat: Pattern) -> Iterator[bool]:
+        if not pat._context_free:
+            for _ in self:
+                yield True
+            return
+        matches = None  # scan the full text only once there is an aligned sentence to rule out
+        m = None
+        for sentence, aligned in self._iter_alignment():
+            if not aligned:
+                yield True
+                continue
+            if matches is None:
+                matches = pat.prescan(self.text, sentence.start)
+                m = next(matches, None)
+            while m is not None and m.end() < sentence.start:
+                m = next(matches, None)
+            yield m is not None and m.start() <= sentence.end
+
+    def scan(self, pat: Pattern) -> Iterator[Sentence]:
+        """
+        Run a single pass of `pat` over the full text, and yield only those sentences
+            which might contain a match. These still need to be confirmed by searching
+            the sentence (e.g., to apply negation).
+        :param pat:
+        :return:
+        """
+        for sentence, candidate in zip(self, self._iter_candidates(pat)):
+            if candidate:
+                yield sentence
 
     def has_pattern(self, pat, ignore_negation=False):
-        for sentence in self.sentences:
-            if sentence.has_pattern(pat, ignore_negation=ignore_negation):
+        return self._has_pattern(pat, self._iter_candidates(pat), ignore_negation=ignore_negation)
+
+    def _has_pattern(self, pat, candidates: Iterable[bool], ignore_negation=False):
+        for sentence, candidate in zip(self, candidates):
+            if not candidate:
+                sentence._update_last_search(False)  # same record as an unsuccessful search
+            elif sentence.has_pattern(pat, ignore_negation=ignore_negation):
                 return sentence.text
         return False
 
     def has_patterns(self, *pats, has_all=False, ignore_negation=False):
+        if not has_all and (union := Pattern.union(*pats)):
+            # a single scan rules out sentences for all patterns
+            candidates = list(self._iter_candidates(union))
+            for pat in pats:
+                if self._has_pattern(pat, candidates, ignore_negation=ignore_negation):
+                    return True
+            return False
         for pat in pats:
             if has_all and not self.has_pattern(pat, ignore_negation=ignore_negation):
                 return False
@@ -32,19 +150,53 @@ class Sentences:
         :param get_indices: if True, return (group, start, end)
         :return:
         """
-        for sentence in self.sentences:
-            if m := sentence.get_pattern(pat, index=index, get_indices=get_indices):
+        for sentence, candidate in zip(self, self._iter_candidates(pat)):
+            if not candidate:
+                sentence._update_last_search(False)  # same record as an unsuccessful search
+            elif m := sentence.get_pattern(pat, index=index, get_indices=get_indices):
                 return m  # tuple if requested indices
 
     def get_patterns(self, *pats: Pattern, index=0, return_negation=False):
-        for sentence in self.sentences:
-            yield from sentence.get_patterns(*pats, index=index, return_negation=return_negation)
+        for sentence, candidate_pats in self._iter_candidate_patterns(pats):
+            yield from sentence.get_patterns(*candidate_pats, index=index, return_negation=return_negation)
+
+    def get_pattern_spans(self, *pats: Pattern, index=0):
+        """See `Sentence.get_pattern_spans`"""
+        for sentence, candidate_pats in self._iter_candidate_patterns(pats):
+            yield from sentence.get_pattern_spans(*candidate_pats, index=index)
+
+    def get_combined(self, union: UnionPattern, *, return_negation=False):
+        """See `Sentence.get_combined`"""
+        for sentence, candidate in zip(self, self._iter_candidates(union)):
+            if not candidate:
+                sentence._update_last_search(False)  # same record as an unsuccessful search
+            else:
+                yield from sentence.get_combined(union, return_negation=return_negation)
+
+    def count_patterns(self, *pats: Pattern, ignore_negation=False) -> int:
+        """See `Sentence.count_patterns`"""
+        return sum(sentence.count_patterns(*candidate_pats, ignore_negation=ignore_negation)
+                   for sentence, candidate_pats in self._iter_candidate_patterns(pats))
+
+    def _iter_candidate_patterns(self, pats):
+        """Each sentence with those patterns which might match it"""
+        candidates = zip(*(self._iter_candidates(pat) for pat in pats)) if pats else itertools.repeat(())
+        for sentence, is_candidate in zip(self, candidates):
+            yield sentence, [pat for pat, c in zip(pats, is_candidate) if c]
+
+    def get_all_patterns(self, pset: PatternSet, *, index=0, return_negation=False):
+        """See `Sentence.get_all_patterns`"""
+        for sentence in self:
+            yield from sentence.get_all_patterns(pset, index=index, return_negation=return_negation)
 
     def __len__(self):
         return len(self.sentences)
 
     def __iter__(self) -> Iterator[Sentence]:
-        return iter(self.sentences)
+        i = 0
+        while i < len(self._sentences) or self._split_next() is not None:
+            yield self._sentences[i]
+            i += 1
 
     def __getitem__(self, item):
         return self.sentences[item]
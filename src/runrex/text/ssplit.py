@@ -1,5 +1,5 @@
 import re
-from typing import Tuple
+from typing import Iterator, Tuple
 from loguru import logger
 
 try:
@@ -9,18 +9,42 @@ except ImportError:
     syntok_segmenter = False
 
 
+_REGEX_SPECIAL_CHARS = re.compile(r'[\\.^$*+?{}\[\]|()]')
+# newline which is not part of a paragraph break
+_SINGLE_NEWLINE = re.compile(r'(?<!\n)\n(?!\n)')
+# whitespace after end of sentence (excluding abbreviations, e.g., 'e.g.' or 'Mr.')
+_SENTENCE_END = re.compile(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!|\*)\s')
+# start of list item within a sentence
+_BULLET = re.compile(r'[*•-]')
+
+
+def _iter_delim_ends(text: str, delim: str) -> Iterator[int]:
+    """End offset of each occurrence of `delim` (regular expression) in `text`"""
+    if delim and not _REGEX_SPECIAL_CHARS.search(delim):
+        # plain string (e.g., newline): avoid building match objects
+        idx = text.find(delim)
+        while idx != -1:
+            idx += len(delim)
+            yield idx
+            idx = text.find(delim, idx)
+    else:
+        for m in re.finditer(delim, text):
+            yield m.end()
+
+
 def keep_offsets_ssplit(text: str, delim='\n') -> Tuple[str, int, int]:
     start = 0
-    for m in re.finditer(delim, text):
-        yield text[start:m.end()], start, m.end()
-        start = m.end()
+    for end in _iter_delim_ends(text, delim):
+        yield text[start:end], start, end
+        start = end
     yield text[start:], start, len(text)
 
 
 def delim_ssplit(text: str, *, delim='\n') -> Tuple[str, int, int]:
     start = 0
-    for m in re.finditer(delim, text):
-        sentence = ' '.join(text[start:m.end()].split())
+    for delim_end in _iter_delim_ends(text, delim):
+        # collapse whitespace: str.split/join is several times faster than re.sub(r'\s+', ...)
+        sentence = ' '.join(text[start:delim_end].split())
         end = start + len(sentence)
         yield sentence, start, end
         start = end
@@ -31,7 +55,7 @@ def delim_ssplit(text: str, *, delim='\n') -> Tuple[str, int, int]:
 def syntok_ssplit(text: str, ignore_newlines=True) -> Tuple[str, int, int]:
     if ignore_newlines:
         # remove only single newlines, assume multiples are paragraph breaks
-        text = ' '.join(re.split(r'(?<!\n)\n(?!\n)', text))
+        text = _SINGLE_NEWLINE.sub(' ', text)
     start = 0
     for paragraph in syntok_segmenter.analyze(text):
         for sentence in paragraph:
@@ -43,12 +67,11 @@ def syntok_ssplit(text: str, ignore_newlines=True) -> Tuple[str, int, int]:
 
 def regex_ssplit(text: str, *, delim='\n') -> Tuple[str, int, int]:
     text = ' '.join(text.split(delim))  # join broken lines
-    sub_pat = re.compile(r'[*•-]')
     start = 0
-    for m in re.finditer(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!|\*)\s', text):
-        yield from _subsplit(text[start: m.start()], start, sub_pat)
+    for m in _SENTENCE_END.finditer(text):
+        yield from _subsplit(text[start: m.start()], start, _BULLET)
         start = m.start()
-    yield from _subsplit(text[start:], start, sub_pat)
+    yield from _subsplit(text[start:], start, _BULLET)
 
 
 def _subsplit(sentence: str, start: int, pattern) -> Tuple[str, int, int]:
@@ -0,0 +1,37 @@
+import re
+
+import pytest
+
+from runrex.algo.analysis import fold, required_literals
+from runrex.algo.prefilter import LiteralFilter
+from runrex.algo import Pattern
+
+
+@pytest.mark.parametrize(('pattern', 'exp'), [
+    (r'financial\W?burden', ('financial',)),
+    (r'(?:can.t|unable to) afford', (' afford',)),
+    (r'(abc)?Def', ('def',)),
+    (r'a|bcdef', None),  # no literal is required
+    (r'\bno\b', None),  # too short
+    (r'(this|that)', ('this', 'that')),  # any of alternation
+    (r'a(b|c)[de]f', ('abdf', 'abef', 'acdf', 'acef')),
+    (r'\bpain(ful|s)?|ach(es|ing)', ('pain', 'aches', 'aching')),
+    (r'(?:a|bc)+def', ('def',)),  # repetition interrupts literal
+])
+def test_required_literals(pattern, exp):
+    assert required_literals(pattern, re.IGNORECASE) == exp
+
+
+@pytest.mark.parametrize(('literal', 'text'), [
+    ('istanbul', 'İSTANBUL'),
+    ('istanbul', 'ıstanbul'),
+    ('kelvin', '\u212aelvin'),
+])
+def test_fold_retains_case_insensitive_matches(literal, text):
+    assert re.search(literal, text, re.IGNORECASE)
+    assert required_literals(literal, re.IGNORECASE)[0] in fold(text)
+
+
+def test_literal_filter():
+    lf = LiteralFilter([Pattern('financial burden'), Pattern('afford'), Pattern(r'\bno\b')])
+    assert lf.candidates(fold('Unable to AFFORD it')) == {1, 2}
@@ -1,6 +1,11 @@
+import pickle
+import re
+
 import pytest
 
 from runrex.algo import Pattern, Negation
+from runrex.algo.analysis import fold
+from runrex.algo.backend import _matches_like_re2
 from runrex.text import Sentence
 from runrex.text import Sentences
 from runrex.text.ssplit import keep_offsets_ssplit
@@ -99,6 +104,16 @@ def test_pattern_finditer_sentences(pat: Pattern, text: str, n_matches):
     assert len(matches) == n_matches
 
 
+@pytest.mark.parametrize(('pat', 'text', 'n_matches'), [
+    (Pattern('(this|that)'), ' I want this, or that.\n\n But not that', 3),
+    (Pattern('(this|that)', negates=['not']), ' I want this, or that.\n\n But not that', 2),
+    (Pattern('that'), ' I want this, or that.\n\n But not that', 2),
+])
+def test_pattern_count_sentences(pat: Pattern, text: str, n_matches):
+    assert Sentences(text).count_patterns(pat) == n_matches
+    assert sum(Sentence(sent).count_patterns(pat) for sent in text.split('\n')) == n_matches
+
+
 @pytest.mark.parametrize(('pat', 'text', 'n_matches', 'n_negation'), [
     (Pattern('(this|that)', negates=['not']), ' I want this, or that.\n\n But not that', 3, 1),
 ])
@@ -107,3 +122,170 @@ def test_pattern_finditer_sentences_return_negation(pat: Pattern, text: str, n_m
     matches = list(sentences.get_patterns(pat, return_negation=True))
     assert len(matches) == n_matches
     assert len([is_neg for _, _, _, is_neg in matches if is_neg]) == n_negation
+
+
+@pytest.mark.parametrize('backend', ['re', 're2', 'regex'])
+def test_pattern_backend(backend):
+    """Unavailable/unsupported backends fall back to `re`"""
+    pat = Pattern(r'(?<!-)(this|that)', negates=[r'\bnever\b'], backend=backend)
+    assert pat.matches('I want this').group() == 'this'
+    assert pat.matches('I never want this') is False
+
+
+@pytest.mark.parametrize(('pattern', 'flags', 'exp'), [
+    (r'this\W?that', 0, False),  # \W is Unicode in re
+    (r'\bthis\b', re.ASCII, True),
+    (r'this\sthat', re.ASCII, False),  # re2 \s omits \v
+    (r'this\\w', 0, True),  # escaped backslash
+    (r'this\\\w', 0, False),
+    ('this|that', re.IGNORECASE, True),
+    ('pain$', re.IGNORECASE, False),  # re2 $ does not match before final newline
+    ('pain$', re.IGNORECASE | re.MULTILINE, True),
+    (r'\$5', re.IGNORECASE, True),  # escaped
+    (r'\bthis\b', re.ASCII | re.IGNORECASE, False),  # re2 'k' still matches Kelvin sign
+    ('d\u0131zzy', re.IGNORECASE, False),  # dotless i
+])
+def test_matches_like_re2(pattern, flags, exp):
+    assert _matches_like_re2(pattern, flags) is exp
+
+
+@pytest.mark.parametrize(('pattern', 'flags', 'text', 'exp'), [
+    ('pain$', re.IGNORECASE, 'back pain\n', 'pain'),
+    ('pain$', re.IGNORECASE | re.MULTILINE, 'back pain\nhere', 'pain'),
+    ('back pain', re.IGNORECASE, 'BACK PAIN', 'BACK PAIN'),
+])
+def test_pattern_re2_backend(pattern, flags, text, exp):
+    pytest.importorskip('re2')
+    pat = Pattern(pattern, replace_whitespace=None, flags=flags, backend='re2')
+    assert pat.matches(text).group() == exp
+
+
+def test_pattern_unknown_backend():
+    with pytest.raises(ValueError):
+        Pattern('this', backend='unknown')
+
+
+def test_pattern_union():
+    union = Pattern.union(Pattern('(this|that)'), Pattern(r'\bthose\b'))
+    assert [(i, m.group()) for i, m in union.finditer('I want this or those')] == [(0, 'this'), (1, 'those')]
+    assert union.search('I want these') is None
+
+
+@pytest.mark.parametrize('pats', [
+    (Pattern('this'),),  # nothing to combine
+    (Pattern('this'), Pattern('that', flags=0)),  # differing flags
+    (Pattern(r'(t)his\1'), Pattern('that')),  # backreference
+    (Pattern('back pain', replace_whitespace=None), Pattern('(?x) pain  ful', replace_whitespace=None)),  # global flag
+])
+def test_pattern_union_not_possible(pats):
+    assert Pattern.union(*pats) is None
+
+
+def test_sentence_has_patterns_global_flag():
+    """Global flag must not apply to other patterns (python < 3.11 allows it in an alternation)"""
+    assert Sentence('back pain').has_patterns(
+        Pattern('back pain', replace_whitespace=None), Pattern('(?x) pain  ful', replace_whitespace=None)
+    )
+
+
+def test_pattern_compiled_once():
+    pat1 = Pattern('this or that', negates=['not'])
+    pat2 = Pattern('this or that', negates=['not'])
+    assert pat1.pattern is pat2.pattern
+    assert pat1.negates[0][0] is pat2.negates[0][0]
+
+
+@pytest.mark.parametrize('backend', ['re', 're2', 'regex'])
+def test_pattern_pickle(backend):
+    pat = Pattern('this or that', negates_pre=['not'], requires_all=['want'], backend=backend)
+    unpickled = pickle.loads(pickle.dumps(pat))
+    assert unpickled.pattern is pat.pattern  # reuses compiled pattern
+    assert unpickled.text == str(pat) == r'this\W?or\W?that'
+    assert unpickled.negates[0][0] is pat.negates[0][0]
+    assert unpickled.matches('I want this or that').group() == 'this or that'
+    assert unpickled.matches('I do not want this or that') is False
+
+
+def test_pattern_re2_pickle():
+    pytest.importorskip('re2')
+    pat = Pattern('this or that', negates=['not'], replace_whitespace=None, backend='re2')
+    assert not isinstance(pat.pattern, re.Pattern)
+    assert pat.text == 'this or that'  # without re2's inline flags
+    unpickled = pickle.loads(pickle.dumps(pat))
+    assert unpickled.text == 'this or that'
+    assert unpickled.pattern is pat.pattern
+    assert unpickled.negates[0][0] is pat.negates[0][0]
+
+
+def test_pattern_alternation_not_rewritten():
+    """Groups must capture the full alternative (engines already factor common prefixes)"""
+    pat = Pattern('(this|that|these|those)')
+    assert pat.text == '(this|that|these|those)'
+    assert pat.matches('I want these').group(1) == 'these'
+
+
+@pytest.mark.parametrize(('text', 'exp'), [
+    ('No BURDEN, just a Burden', [3, 18]),
+    ('\u212aelvin burden', [7]),  # non-ascii: searched by regex
+    ('Nothing', []),
+])
+def test_pattern_ascii_literal(text, exp):
+    pat = Pattern('burden')
+    assert pat._ascii_literal == 'burden'
+    assert [m.start() for m in pat.finditer(text)] == exp
+    assert (pat.matches(text).start() if exp else pat.matches(text)) == (exp[0] if exp else False)
+
+
+@pytest.mark.parametrize(('text', 'exp'), [
+    ('not this', False),
+    ('not sure about this', 'this'),  # 'not' must immediately precede
+])
+def test_pattern_negates_pre_anchored(text, exp):
+    pat = Pattern('this', negates_pre=[r'\bnot\W*$'])
+    m = pat.matches(text)
+    assert (m.group() if m else m) == exp
+
+
+def test_pattern_regex_backend_possessive():
+    pytest.importorskip('regex')
+    pat = Pattern(r'(?>\w+)\W++pain', backend='regex')
+    assert pat.matches('chronic pain').group() == 'chronic pain'
+
+
+def test_pattern_regex_backend_flags():
+    """`re` flags are translated: `re.ASCII` has the same value as `regex.VERSION1`"""
+    pytest.importorskip('regex')
+    assert Pattern(r'caf\w', flags=re.IGNORECASE | re.ASCII, backend='regex').matches('café') is False
+    assert Pattern(r'[a-z--b]x', backend='regex').matches('bx')  # not a VERSION1 set difference
+
+
+def test_pattern_regex_backend_fuzzy():
+    """Fuzzy syntax is not a literal"""
+    pytest.importorskip('regex')
+    pat = Pattern(r'(?:burden){e<=1}', backend='regex')
+    assert pat._ascii_literal is None
+    assert pat.literals is None
+    assert not pat._context_free
+    assert pat.matches('a burdon here').group() == 'burdon'
+    assert Sentence('a burdon here').has_pattern(pat)
+    assert Sentences('First.\nA burdon here.\n', None, ssplit=keep_offsets_ssplit).has_pattern(pat)
+
+
+@pytest.mark.parametrize(('text', 'exp'), [
+    ('xab', ('a', 'b')),
+    ('xcd', ('c', 'd')),
+])
+def test_pattern_capture_length(text, exp):
+    pat = Pattern('(?:(a)(b)|(c)(d))', capture_length=2)
+    assert pat.matches(text).groups() == exp
+    assert [m.groups() for m in pat.finditer(text)] == [exp]
+
+
+@pytest.mark.parametrize(('text', 'exp'), [
+    ('CHRONIC PAIN', True),
+    ('chronic', False),
+])
+def test_pattern_may_match(text, exp):
+    pat = Pattern(r'\bpain\b')
+    assert pat.may_match(fold(text)) is exp
+    assert bool(Sentence(text).has_pattern(pat)) is exp
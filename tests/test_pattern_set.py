@@ -0,0 +1,90 @@
+import re
+
+import pytest
+
+from runrex.algo import Pattern, PatternSet
+from runrex.text import Sentence, Sentences
+from runrex.text.ssplit import keep_offsets_ssplit
+
+PATTERNS = [
+    Pattern('(this|that)'),
+    Pattern(r'\bburden\b', negates=[r'\bno\b']),
+    Pattern(r'(?<!-)pain'),  # lookbehind
+    Pattern(r'\bno\b'),  # no literals
+]
+
+
+@pytest.mark.parametrize('text', [
+    'I want this or that.',
+    'No burden here.',
+    'A burden with some pain.',
+    'Ça, c\'est une douleur: pain.',  # non-ascii
+    'Nothing.',
+])
+def test_pattern_set_candidates(text):
+    pset = PatternSet(PATTERNS)
+    candidates = pset.candidates(text)
+    for i, pat in enumerate(PATTERNS):
+        if pat.pattern.search(text):
+            assert i in candidates
+
+
+def test_sentence_get_all_patterns():
+    sentence = Sentence('No, that burden is a pain.')
+    assert list(sentence.get_all_patterns(PatternSet(PATTERNS))) == [
+        (0, 'that', 4, 8), (2, 'pain', 21, 25), (3, 'No', 0, 2),
+    ]
+    assert sentence.last_found
+
+
+def test_sentences_get_all_patterns():
+    pset = PatternSet(PATTERNS)
+    text = 'I want this.\nA burden.\nNothing.\n'
+    expected = [(i, *m) for i, pat in enumerate(pset)
+                for m in Sentences(text, None, ssplit=keep_offsets_ssplit).get_patterns(pat)]
+    result = list(Sentences(text, None, ssplit=keep_offsets_ssplit).get_all_patterns(pset))
+    assert sorted(result, key=lambda x: x[2]) == sorted(expected, key=lambda x: x[2])
+
+
+def test_sentence_encoded_text():
+    sentence = Sentence('  Ça va. ')
+    assert sentence.encoded_text == 'Ça va.'.encode('utf8')
+    assert sentence.encoded_text is sentence.encoded_text  # cached
+
+
+@pytest.mark.parametrize('pattern, text', [
+    (r'\bfinancial\W+(?:\w+\W+){,3}burden', 'Patient reports financial and emotional burden.'),
+    ('Kelvin', 'kelvin'),  # Kelvin sign
+    ('straſe', 'strase'),  # long s
+    ('dızzy', 'DIZZY'),  # dotless i
+    (r'a\sb', 'a\x1cb'),  # \s includes \x1c-\x1f in re
+])
+def test_pattern_set_python_only_syntax(pattern, text):
+    pset = PatternSet([Pattern(pattern), Pattern('(this|that)')])
+    assert 0 in pset.candidates(text)
+    assert [m[0] for m in Sentence(text).get_all_patterns(pset)] == [0]
+
+
+@pytest.mark.parametrize('pattern, flags, text', [
+    (r'ba*$', re.IGNORECASE, 'x' * 20 + ' ba'),  # end anchor
+    (r'^(?<!b)$\Z', re.IGNORECASE | re.MULTILINE, '\tB \n'),  # lookbehind
+    (r'(a)\1(a|b)[^a]', re.IGNORECASE, 'aab '),  # backreference
+])
+def test_pattern_set_prefilter_unsafe(pattern, flags, text):
+    pat = Pattern(pattern, replace_whitespace=None, flags=flags)
+    assert pat.pattern.search(text)
+    assert 0 in PatternSet([pat]).candidates(text)
+
+
+def test_pattern_set_shared_with_backreference():
+    pset = PatternSet([Pattern(r'[ab]x{1,2}', replace_whitespace=None),
+                       Pattern(r'(a)\1(a|b)[^a]', replace_whitespace=None)])
+    assert 0 in pset.candidates('a bx')
+
+
+def test_pattern_set_regex_backend():
+    pytest.importorskip('regex')
+    pat = Pattern(r'(?:burden){e<=1}', backend='regex')
+    pset = PatternSet([pat, Pattern('(this|that)')])
+    assert 0 in pset.candidates('a burdon here')
+    assert list(Sentence('a burdon here').get_all_patterns(pset)) == [(0, 'burdon', 2, 8)]
@@ -1,5 +1,8 @@
+import pickle
+
 import pytest
 
+from runrex.algo import Pattern
 from runrex.text import Sentences
 from runrex.text.ssplit import keep_offsets_ssplit, syntok_ssplit
 
@@ -43,3 +46,101 @@ def test_syntok_sentence_segmentation(text, n_sent, exp_indices):
     for sent, (exp_start, exp_end) in zip(sents, exp_indices):
         assert sent.start == exp_start
         assert sent.end == exp_end
+
+
+@pytest.mark.parametrize(('pattern', 'exp'), [
+    (r'\bthis\b', [True, False, True]),
+    (r'this\W+these', [True, True, False]),  # spans sentences: both must be searched
+    (r'^th', [True, True, True]),  # anchored: cannot be ruled out
+])
+def test_sentences_scan(pattern, exp):
+    sents = Sentences('I want this.\nThese and those.\nthis\n', None, ssplit=keep_offsets_ssplit)
+    pat = Pattern(pattern)
+    candidates = list(sents.scan(pat))
+    # never rules out a sentence which matches
+    assert all(sent in candidates for sent in sents if pat.matches(sent.text))
+    assert [sent in candidates for sent in sents] == exp
+
+
+@pytest.mark.parametrize(('text', 'delim', 'regex_delim'), [
+    ('A sentence.\n Another sentence\r\nis here.\n', '\n', r'\n'),
+    ('one;; two;;;three', ';;', r';;'),
+])
+def test_keep_offsets_ssplit_literal_delim(text, delim, regex_delim):
+    assert list(keep_offsets_ssplit(text, delim)) == list(keep_offsets_ssplit(text, regex_delim))
+
+
+def test_sentences_share_repeated_text():
+    sents = Sentences('Reviewed.\nPain.\nReviewed.\n', None, ssplit=keep_offsets_ssplit)
+    assert sents[0].text is sents[2].text
+    assert (sents[2].start, sents[2].end) == (16, 25)
+
+
+def test_sentences_split_lazily():
+    split = []
+
+    def ssplit(text):
+        for sentence in keep_offsets_ssplit(text):
+            split.append(sentence)
+            yield sentence
+
+    sents = Sentences('No.\nI want this.\nThese and those.\n', None, ssplit=ssplit)
+    assert sents.get_pattern(Pattern('this')) == 'this'
+    assert len(split) == 2  # stopped at first match
+    assert len(sents) == 3
+    assert [sent.text for sent in sents] == ['No.', 'I want this.', 'These and those.']
+
+
+def test_sentences_get_pattern_confirms_candidates():
+    sents = Sentences('Not this.\nNone here.\nBut this.\n', None, ssplit=keep_offsets_ssplit)
+    pat = Pattern(r'\bthis\b', negates=[r'\bnot\b'])
+    assert sents.get_pattern(pat, get_indices=True) == ('this', 25, 29)
+    assert [sent._last_search_found_pattern for sent in sents] == [[False], [False], [True]]
+
+
+def test_sentences_get_pattern_spans():
+    text = 'I want this.\nNot that.\nThis and that.\n'
+    pat = Pattern(r'\b(this|that)\b', negates=[r'\bnot\b'])
+    spans = list(Sentences(text, None, ssplit=keep_offsets_ssplit).get_pattern_spans(pat))
+    assert spans == [(start, end) for _, start, end
+                     in Sentences(text, None, ssplit=keep_offsets_ssplit).get_patterns(pat)]
+    assert [text[start:end] for start, end in spans] == ['this', 'This', 'that']
+
+
+def test_sentences_pickle_splits_remaining_text():
+    sents = Sentences('No.\nI want this.\nThese and those.\n', None, ssplit=keep_offsets_ssplit)
+    assert next(iter(sents)).text == 'No.'  # only partially split
+    unpickled = pickle.loads(pickle.dumps(sents))
+    assert [sent.text for sent in unpickled] == ['No.', 'I want this.', 'These and those.']
+
+
+def test_sentences_get_combined():
+    text = 'I want this.\nNot that pain.\nThis and that.\n'
+    pats = [Pattern(r'\b(this|that)\b', negates=[r'\bnot\b']), Pattern('pain')]
+    union = Pattern.union(*pats)
+    sents = Sentences(text, None, ssplit=keep_offsets_ssplit)
+    assert list(sents.get_combined(union)) == [
+        (0, 'this', 7, 11), (1, 'pain', 22, 26), (0, 'This', 28, 32), (0, 'that', 37, 41),
+    ]
+    sents = Sentences(text, None, ssplit=keep_offsets_ssplit)
+    assert [is_neg for *_, is_neg in sents.get_combined(union, return_negation=True)] == [
+        False, True, False, False, False,
+    ]
+
+
+def test_sentences_get_combined_negates_post():
+    """Negation is checked within each sentence, not at document offsets"""
+    text = 'First line here.\nI want this not.\nI want this.\n'
+    pats = [Pattern('this', negates_post=['not']), Pattern('line')]
+    result = list(Sentences(text, None, ssplit=keep_offsets_ssplit).get_combined(Pattern.union(*pats)))
+    assert result == [(1, 'line', 6, 10), (0, 'this', 41, 45)]
+
+
+def test_sentences_get_patterns_negates_post():
+    """Negation is checked within each sentence, not at document offsets"""
+    text = 'First line here.\nI want this not.\nI want this.\n'
+    pat = Pattern('this', negates_post=['not'])
+    assert list(Sentences(text, None, ssplit=keep_offsets_ssplit).get_patterns(pat)) == [('this', 41, 45)]
+    assert Sentences(text, None, ssplit=keep_offsets_ssplit).count_patterns(pat) == 1
+    assert [m[1:] for m in Sentences(text, None, ssplit=keep_offsets_ssplit).get_combined(
+        Pattern.union(pat, Pattern('these')))] == [('this', 41, 45)]
@@ -0,0 +1,19 @@
+import pytest
+
+from runrex.io.utils import read_text
+
+
+@pytest.mark.parametrize('data', [
+    b'no newlines',
+    b'unix\nnewlines\n',
+    b'windows\r\nnewlines\r\n',
+    b'mac\rnewlines\r',
+    b'mixed\r\n\r\rnewlines\n\r',
+    'café\r\n'.encode('utf8'),
+])
+def test_read_text_as_text_mode(tmp_path, data):
+    path = tmp_path / 'doc.txt'
+    path.write_bytes(data)
+    with open(path, encoding='utf8') as fh:
+        expected = fh.read()
+    assert read_text(path) == expected